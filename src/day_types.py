@@ -16,6 +16,8 @@ References:
 """
 from typing import Dict
 
+import numpy as np
+
 # IB size thresholds (percent of 09:15 open price)
 IB_SMALL_LT = 0.33
 IB_MEDIUM_LE = 1.00
@@ -27,6 +29,16 @@ IB_RATIO_TREND_SMALL = 0.25  # small IB => Trend candidate
 CLOSE_NEAR_EXTREME_LE = 0.15  # close within 15% of day range from an extreme
 CLOSE_NEAR_MID_LE = 0.30      # Neutral Center: close near mid (<=30%)
 
+# Label ids used by the lookup-table classifier
+DAY_TYPE_NAMES = np.array([
+    "Non-trend Day",
+    "Normal Day",
+    "Normal Variation Day",
+    "Neutral Center Day",
+    "Neutral Extreme Day",
+    "Trend Day",
+])
+
 
 def classify_ib_size(ib_pct: float) -> str:
     if ib_pct < IB_SMALL_LT:
@@ -36,6 +48,52 @@ def classify_ib_size(ib_pct: float) -> str:
     return "Large"
 
 
+def classify_day_type_vec(ib_ratio, re_up, re_down, close_pos_mid, close_dist_from_extreme) -> np.ndarray:
+    """Vectorized day-type classification over whole metric columns.
+
+    Accepts array-likes (or scalars) of equal length and returns an array of day-type
+    labels. Conditions are evaluated in the same priority order as the rules below.
+    """
+    ib_ratio = np.asarray(ib_ratio, dtype=float)
+    re_up = np.asarray(re_up, dtype=bool)
+    re_down = np.asarray(re_down, dtype=bool)
+    close_pos_mid = np.asarray(close_pos_mid, dtype=float)
+    close_near_extreme = np.asarray(close_dist_from_extreme, dtype=float) <= CLOSE_NEAR_EXTREME_LE
+
+    both = re_up & re_down
+    one_sided = re_up ^ re_down
+    neither = ~re_up & ~re_down
+
+    conditions = [
+        # Neutral Center: both-side extension & close near mid
+        both & (close_pos_mid <= CLOSE_NEAR_MID_LE),
+        # Neutral Extreme: both-side extension & close near one extreme
+        both & close_near_extreme,
+        # Non-trend: very wide IB and no extension
+        (ib_ratio >= IB_RATIO_VERY_WIDE) & neither,
+        # Normal: wide IB, no extension
+        (ib_ratio >= IB_RATIO_WIDE) & neither,
+        # Normal Variation: wide IB, one-sided extension
+        (ib_ratio >= IB_RATIO_WIDE) & one_sided,
+        # Trend: small IB, one-sided extension with close near extreme
+        (ib_ratio <= IB_RATIO_TREND_SMALL) & one_sided & close_near_extreme,
+        # Fallbacks: both extensions but not mid/extreme => general Neutral
+        both,
+        one_sided,
+    ]
+    choices = [
+        "Neutral Center Day",
+        "Neutral Extreme Day",
+        "Non-trend Day",
+        "Normal Day",
+        "Normal Variation Day",
+        "Trend Day",
+        "Neutral Center Day",
+        "Normal Variation Day",
+    ]
+    return np.select(conditions, choices, default="Non-trend Day")
+
+
 def classify_day_type(m: Dict) -> str:
     """Return one of day types using IB vs day range and extension behavior.
 
@@ -44,40 +102,86 @@ def classify_day_type(m: Dict) -> str:
     - re_up / re_down: range extension beyond IB high/low
     - close_pos_mid: |close - mid| / day range
     - close_dist_from_extreme: min distance to an extreme / day range
+
+    Thin scalar wrapper around `classify_day_type_vec`.
+    """
+    return str(classify_day_type_vec(
+        m["ib_ratio"], m["re_up"], m["re_down"],
+        m["close_pos_mid"], m["close_dist_from_extreme"],
+    ))
+
+
+def classify_day_type_expr():
+    """Polars expression equivalent of `classify_day_type_vec`.
+
+    Evaluates against columns named like the metrics dict keys; requires `polars`.
+    """
+    import polars as pl
+
+    re_up, re_down = pl.col("re_up"), pl.col("re_down")
+    ib_ratio = pl.col("ib_ratio")
+    close_near_extreme = pl.col("close_dist_from_extreme") <= CLOSE_NEAR_EXTREME_LE
+    both = re_up & re_down
+    one_sided = re_up ^ re_down
+    neither = ~re_up & ~re_down
+
+    return (
+        pl.when(both & (pl.col("close_pos_mid") <= CLOSE_NEAR_MID_LE)).then(pl.lit("Neutral Center Day"))
+        .when(both & close_near_extreme).then(pl.lit("Neutral Extreme Day"))
+        .when((ib_ratio >= IB_RATIO_VERY_WIDE) & neither).then(pl.lit("Non-trend Day"))
+        .when((ib_ratio >= IB_RATIO_WIDE) & neither).then(pl.lit("Normal Day"))
+        .when((ib_ratio >= IB_RATIO_WIDE) & one_sided).then(pl.lit("Normal Variation Day"))
+        .when((ib_ratio <= IB_RATIO_TREND_SMALL) & one_sided & close_near_extreme).then(pl.lit("Trend Day"))
+        .when(both).then(pl.lit("Neutral Center Day"))
+        .when(one_sided).then(pl.lit("Normal Variation Day"))
+        .otherwise(pl.lit("Non-trend Day"))
+    )
+
+
+def _ib_ratio_bin(ib_ratio):
+    """0: <= trend-small, 1: between, 2: wide, 3: very wide."""
+    ib_ratio = np.asarray(ib_ratio, dtype=float)
+    return ((ib_ratio > IB_RATIO_TREND_SMALL).astype(np.intp)
+            + (ib_ratio >= IB_RATIO_WIDE) + (ib_ratio >= IB_RATIO_VERY_WIDE))
+
+
+def _build_day_type_lut() -> np.ndarray:
+    """Classify one representative point per bin into a (re_up, re_down, ib, mid, extreme) table.
+
+    Bin edges are exactly the rule thresholds, so every input in a bin gets the same label
+    as `classify_day_type_vec` would give it.
+    """
+    flags = np.array([False, True])
+    ib_reps = np.array([
+        IB_RATIO_TREND_SMALL,
+        (IB_RATIO_TREND_SMALL + IB_RATIO_WIDE) / 2,
+        (IB_RATIO_WIDE + IB_RATIO_VERY_WIDE) / 2,
+        IB_RATIO_VERY_WIDE,
+    ])
+    mid_reps = np.array([CLOSE_NEAR_MID_LE, CLOSE_NEAR_MID_LE + 0.1])
+    ext_reps = np.array([CLOSE_NEAR_EXTREME_LE, CLOSE_NEAR_EXTREME_LE + 0.1])
+    re_up, re_down, ib, mid, ext = np.meshgrid(flags, flags, ib_reps, mid_reps, ext_reps, indexing="ij")
+    labels = classify_day_type_vec(ib, re_up, re_down, mid, ext)
+    lut = np.empty(labels.shape, dtype=np.uint8)
+    for i, name in enumerate(DAY_TYPE_NAMES):
+        lut[labels == name] = i
+    return lut
+
+
+DAY_TYPE_LUT = _build_day_type_lut()
+
+
+def classify_day_type_lut(ib_ratio, re_up, re_down, close_pos_mid, close_dist_from_extreme) -> np.ndarray:
+    """Same labels as `classify_day_type_vec`, via one fancy-index into DAY_TYPE_LUT.
+
+    Inputs are binned at the rule thresholds (re_up/re_down x 4 IB bins x 2 x 2), so the
+    whole classification is a handful of comparisons plus a table gather.
     """
-    ib_ratio = m["ib_ratio"]
-    re_up, re_down = m["re_up"], m["re_down"]
-    close_pos_mid = m["close_pos_mid"]
-    close_near_extreme = m["close_dist_from_extreme"] <= CLOSE_NEAR_EXTREME_LE
-
-    # Neutral Center: both-side extension & close near mid
-    if re_up and re_down and close_pos_mid <= CLOSE_NEAR_MID_LE:
-        return "Neutral Center Day"
-
-    # Neutral Extreme: both-side extension & close near one extreme
-    if re_up and re_down and close_near_extreme:
-        return "Neutral Extreme Day"
-
-    # Non-trend: very wide IB and no extension
-    if ib_ratio >= IB_RATIO_VERY_WIDE and not re_up and not re_down:
-        return "Non-trend Day"
-
-    # Normal: wide IB, no extension
-    if ib_ratio >= IB_RATIO_WIDE and not re_up and not re_down:
-        return "Normal Day"
-
-    # Normal Variation: wide IB, one-sided extension
-    if ib_ratio >= IB_RATIO_WIDE and (re_up ^ re_down):
-        return "Normal Variation Day"
-
-    # Trend: small IB, one-sided extension with close near extreme
-    if ib_ratio <= IB_RATIO_TREND_SMALL and (re_up ^ re_down) and close_near_extreme:
-        return "Trend Day"
-
-    # Fallbacks
-    if re_up and re_down:
-        # if both extensions but not mid/extreme, general Neutral
-        return "Neutral Center Day"
-    if (re_up ^ re_down):
-        return "Normal Variation Day"
-    return "Non-trend Day"
+    idx = DAY_TYPE_LUT[
+        np.asarray(re_up, dtype=np.intp),
+        np.asarray(re_down, dtype=np.intp),
+        _ib_ratio_bin(ib_ratio),
+        (np.asarray(close_pos_mid, dtype=float) > CLOSE_NEAR_MID_LE).astype(np.intp),
+        (np.asarray(close_dist_from_extreme, dtype=float) > CLOSE_NEAR_EXTREME_LE).astype(np.intp),
+    ]
+    return DAY_TYPE_NAMES[idx]
@@ -1,23 +1,35 @@
 
 # -*- coding: utf-8 -*-
+import csv
+import functools
+import json
 import os
+import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
+import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
-from tenacity import retry, stop_after_attempt, wait_exponential
 from dotenv import load_dotenv
 
 try:
     from SmartApi import SmartConnect
+    from SmartApi import smartConnect as smart_connect_module
+    from SmartApi.smartExceptions import SmartAPIException
 except ImportError as e:
     raise SystemExit(f"Import error: {e}\nMake sure all dependencies are installed: pip install -r requirements.txt")
 
 from .day_types import (
-    classify_day_type,
+    classify_day_type_expr,
+    classify_day_type_lut,
     classify_ib_size,
 )
 
@@ -34,6 +46,67 @@ MARKET_OPEN = datetime.strptime("09:15", "%H:%M").time()
 MARKET_CLOSE = datetime.strptime("15:30", "%H:%M").time()
 IB_END = datetime.strptime("10:15", "%H:%M").time()
 
+# Same session times as IST minutes-of-day, for integer bar filters
+MARKET_OPEN_MIN = MARKET_OPEN.hour * 60 + MARKET_OPEN.minute    # 555
+MARKET_CLOSE_MIN = MARKET_CLOSE.hour * 60 + MARKET_CLOSE.minute  # 930
+IB_END_MIN = IB_END.hour * 60 + IB_END.minute                    # 615
+
+# Concurrency for historical fetches (Angel One caps at ~10 requests/sec)
+MAX_WORKERS = 8
+MAX_REQUESTS_PER_SEC = 10
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter: at most `max_calls` per `period` seconds."""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+
+_limiter = RateLimiter(MAX_REQUESTS_PER_SEC, 1.0)
+
+# Reuse a recent Angel One login instead of a fresh TOTP login on every run
+SESSION_CACHE = os.getenv("ANGEL_SESSION_CACHE", ".angel_session.json")
+SESSION_TTL_SEC = 6 * 3600
+
+# Max calendar days per getCandleData request, by interval (Angel One limits)
+MAX_DAYS_PER_REQUEST = {
+    "ONE_MINUTE": 30,
+    "THREE_MINUTE": 60,
+    "FIVE_MINUTE": 100,
+    "TEN_MINUTE": 100,
+    "FIFTEEN_MINUTE": 200,
+    "THIRTY_MINUTE": 200,
+    "ONE_HOUR": 400,
+    "ONE_DAY": 2000,
+}
+
+CANDLE_COLUMNS = ["datetime", "open", "high", "low", "close", "volume"]
+
+# Columns of the per-day stats CSV written by compute_stats
+OUTPUT_FIELDS = ["date", "index", "day_type", "ib_size", "ib_pct", "ib_ratio", "day_range"]
+
+# HTTP statuses worth retrying (rate limit / transient server errors)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# On-disk memo of fetched bars: one parquet per (token, interval, month)
+CACHE_DIR = os.getenv("CANDLE_CACHE_DIR", "cache")
+
 
 def _env(key: str) -> str:
     v = os.getenv(key)
@@ -42,13 +115,87 @@ def _env(key: str) -> str:
     return v
 
 
+class _PooledRequests:
+    """Stand-in for the `requests` module inside SmartApi that routes calls through one Session.
+
+    SmartConnect._request calls `requests.request(...)` directly (its `reqsession` is never
+    used), so without this every API call opens a fresh TLS connection.
+    """
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def request(self, *args, **kwargs):
+        return self._session.request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def _install_pooled_session() -> None:
+    """Share one keep-alive connection pool, sized for the fetch workers, across all calls."""
+    if isinstance(smart_connect_module.requests, _PooledRequests):
+        return
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2 * MAX_WORKERS))
+    smart_connect_module.requests = _PooledRequests(session)
+
+
+def _load_cached_session(api_key: str, client_code: str) -> Optional[SmartConnect]:
+    """Rebuild a SmartConnect from a recent saved login, if it is still accepted by the API."""
+    try:
+        with open(SESSION_CACHE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("client_code") != client_code or time.time() - cached.get("created", 0) > SESSION_TTL_SEC:
+        return None
+
+    obj = SmartConnect(
+        api_key=api_key,
+        access_token=cached["access_token"],
+        refresh_token=cached["refresh_token"],
+        feed_token=cached["feed_token"],
+        userId=cached["user_id"],
+    )
+    try:
+        profile = obj.getProfile(obj.refresh_token)
+    except (SmartAPIException, requests.exceptions.RequestException):
+        return None
+    return obj if profile and profile.get("status") else None
+
+
+def _save_session(obj: SmartConnect, client_code: str) -> None:
+    payload = {
+        "client_code": client_code,
+        "access_token": obj.access_token,
+        "refresh_token": obj.refresh_token,
+        "feed_token": obj.feed_token,
+        "user_id": obj.userId,
+        "created": time.time(),
+    }
+    fd = os.open(SESSION_CACHE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(payload, f)
+
+
 def angel_login() -> SmartConnect:
-    """Authenticate with Angel One SmartAPI using env credentials."""
+    """Authenticate with Angel One SmartAPI using env credentials.
+
+    The returned client is shared by all fetch workers: API calls go through one pooled
+    HTTP session, and a login from the last SESSION_TTL_SEC is reused instead of a new
+    TOTP login.
+    """
     api_key = _env("ANGEL_API_KEY")
     client_code = _env("ANGEL_CLIENT_CODE")
     pin_or_pwd = _env("ANGEL_PIN")
     totp_token = _env("ANGEL_TOTP_TOKEN")
 
+    _install_pooled_session()
+    obj = _load_cached_session(api_key, client_code)
+    if obj is not None:
+        return obj
+
     obj = SmartConnect(api_key=api_key)
     import pyotp
     totp = pyotp.TOTP(totp_token).now()
@@ -57,13 +204,43 @@ def angel_login() -> SmartConnect:
     if not data or not data.get("status"):
         raise RuntimeError(f"Login failed: {data}")
     _ = obj.getfeedToken()
+    _save_session(obj, client_code)
     return obj
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
-def fetch_day_candles(obj: SmartConnect, exchange: str, token: str, day: date, interval: str) -> pd.DataFrame:
-    start_dt = IST.localize(datetime.combine(day, MARKET_OPEN))
-    end_dt = IST.localize(datetime.combine(day, MARKET_CLOSE))
+def _minute_of_day(ts: pd.Series) -> pd.Series:
+    """IST minute-of-day (0..1439) as int32, so session filters are plain integer compares."""
+    local = ts.dt.tz_convert(IST)
+    return (local.dt.hour * 60 + local.dt.minute).astype("int32")
+
+
+def _session_minutes(df: pd.DataFrame) -> pd.Series:
+    """Cached `_mod` column set at fetch time, computed on the fly for frames without it."""
+    return df["_mod"] if "_mod" in df else _minute_of_day(df["datetime"])
+
+
+def _retry_fetch(fn, *args, attempts: int = 3, **kwargs):
+    """Call `fn`, retrying only transient failures with jittered exponential backoff.
+
+    Timeouts, dropped connections and HTTP 429/5xx (SmartAPI errors carry the status in
+    `.code`) are retried; anything else, e.g. auth or input errors, is raised at once.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn(*args, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if attempt == attempts - 1:
+                raise
+        except SmartAPIException as e:
+            if e.code not in RETRY_STATUS or attempt == attempts - 1:
+                raise
+        time.sleep(min(8.0, 0.5 * 2 ** attempt) + random.random() * 0.2)
+
+
+def _get_candles(obj: SmartConnect, exchange: str, token: str, start: date, end: date, interval: str) -> pd.DataFrame:
+    """Single getCandleData call covering market hours from `start` to `end` (inclusive)."""
+    start_dt = IST.localize(datetime.combine(start, MARKET_OPEN))
+    end_dt = IST.localize(datetime.combine(end, MARKET_CLOSE))
 
     params = {
         "exchange": exchange,
@@ -72,23 +249,96 @@ def fetch_day_candles(obj: SmartConnect, exchange: str, token: str, day: date, i
         "fromdate": start_dt.strftime("%Y-%m-%d %H:%M"),
         "todate": end_dt.strftime("%Y-%m-%d %H:%M"),
     }
+    _limiter.acquire()
     data = obj.getCandleData(params)
 
     if not data or not data.get("status") or not data.get("data"):
-        return pd.DataFrame(columns=["datetime", "open", "high", "low", "close", "volume"])
-
-    df = pd.DataFrame(data["data"], columns=["datetime", "open", "high", "low", "close", "volume"])
-    df["datetime"] = pd.to_datetime(df["datetime"])
-    df = df[(df["datetime"].dt.tz_convert(IST).dt.time >= MARKET_OPEN) &
-            (df["datetime"].dt.tz_convert(IST).dt.time <= MARKET_CLOSE)]
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+
+    # Build typed columns straight from the raw rows (no object-column frame in between);
+    # float32 OHLC halves memory traffic and is ample precision for index prices
+    raw = np.array(data["data"], dtype=object)
+    df = pd.DataFrame({
+        # Convert to IST once and cache minute-of-day so downstream filters reuse it
+        "datetime": pd.to_datetime(raw[:, 0], utc=True, cache=True, format="ISO8601").tz_convert(IST),
+        "open": raw[:, 1].astype(np.float32),
+        "high": raw[:, 2].astype(np.float32),
+        "low": raw[:, 3].astype(np.float32),
+        "close": raw[:, 4].astype(np.float32),
+        "volume": raw[:, 5].astype(np.int64),
+    }, copy=False)
+    df["_mod"] = _minute_of_day(df["datetime"])
+    df = df[(df["_mod"] >= MARKET_OPEN_MIN) & (df["_mod"] <= MARKET_CLOSE_MIN)]
     return df
 
 
+def parquet_cached(fetch):
+    """Memoize a range fetcher to month-sized parquet files under CACHE_DIR.
+
+    Historical candles are immutable, so each fully elapsed month is fetched once, written
+    to `{token}_{interval}_{YYYY-MM}.parquet`, and later ranges inside it are served from
+    disk. The current month is always fetched live and never cached.
+    """
+    @functools.wraps(fetch)
+    def wrapper(obj, exchange: str, token: str, start: date, end: date, interval: str) -> pd.DataFrame:
+        frames = []
+        for ws, we in month_windows(start, end):
+            first = ws.replace(day=1)
+            last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            if last >= date.today():
+                frames.append(fetch(obj, exchange, token, ws, we, interval))
+                continue
+
+            path = os.path.join(CACHE_DIR, f"{token}_{interval}_{first:%Y-%m}.parquet")
+            if os.path.exists(path):
+                df = pd.read_parquet(path)
+            else:
+                df = fetch(obj, exchange, token, first, last, interval)
+                if not df.empty:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    tmp = f"{path}.{threading.get_ident()}.tmp"
+                    df.to_parquet(tmp, index=False)
+                    os.replace(tmp, path)
+
+            if not df.empty and (ws, we) != (first, last):
+                day = df["datetime"].dt.tz_convert(IST).dt.normalize()
+                df = df[(day >= pd.Timestamp(ws, tz=IST)) & (day <= pd.Timestamp(we, tz=IST))]
+            frames.append(df)
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=CANDLE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    return wrapper
+
+
+@parquet_cached
+def fetch_range_candles(obj: SmartConnect, exchange: str, token: str, start: date, end: date, interval: str) -> pd.DataFrame:
+    """Fetch candles for a multi-day range, chunked to the API's per-interval day limit."""
+    max_days = MAX_DAYS_PER_REQUEST.get(interval, 30)
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=max_days - 1), end)
+        df = _retry_fetch(_get_candles, obj, exchange, token, chunk_start, chunk_end, interval)
+        if not df.empty:
+            chunks.append(df)
+        chunk_start = chunk_end + timedelta(days=1)
+    if not chunks:
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def fetch_day_candles(obj: SmartConnect, exchange: str, token: str, day: date, interval: str) -> pd.DataFrame:
+    return fetch_range_candles(obj, exchange, token, day, day, interval)
+
+
 def compute_ib_and_day_metrics(df: pd.DataFrame) -> Optional[Dict]:
     if df.empty:
         return None
-    times = df["datetime"].dt.tz_convert(IST).dt.time
-    ib_mask = (times >= MARKET_OPEN) & (times <= IB_END)
+    mod = _session_minutes(df)
+    ib_mask = (mod >= MARKET_OPEN_MIN) & (mod <= IB_END_MIN)
     ib_bars = df[ib_mask]
     if ib_bars.empty:
         return None
@@ -101,11 +351,9 @@ def compute_ib_and_day_metrics(df: pd.DataFrame) -> Optional[Dict]:
     day_low = df["low"].min()
     day_range = day_high - day_low
 
-    open_915_row = df[df["datetime"].dt.tz_convert(IST).dt.time == MARKET_OPEN]
-    if open_915_row.empty:
-        open_915 = float(df.iloc[0]["open"])
-    else:
-        open_915 = float(open_915_row.iloc[0]["open"])
+    # Bars are time-sorted and clipped to market hours, so the first is the 09:15 bar
+    # (or the earliest one available on days it is missing)
+    open_915 = float(df["open"].iat[0])
 
     close = float(df.iloc[-1]["close"])
 
@@ -130,6 +378,172 @@ def compute_ib_and_day_metrics(df: pd.DataFrame) -> Optional[Dict]:
     }
 
 
+def compute_daily_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized IB/day metrics for a multi-day frame, one row per IST trading day.
+
+    Columns match the keys returned by `compute_ib_and_day_metrics`; the index is the
+    IST day (tz-aware midnight). Days without any IB bars are dropped.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    df = df.assign(
+        day=df["datetime"].dt.tz_convert(IST).dt.normalize(),
+        mod=_session_minutes(df),
+    ).sort_values("datetime")
+
+    day_agg = df.groupby("day").agg(
+        day_high=("high", "max"), day_low=("low", "min"),
+        open_915=("open", "first"), close=("close", "last"),
+    )
+    ib_agg = df[(df["mod"] >= MARKET_OPEN_MIN) & (df["mod"] <= IB_END_MIN)].groupby("day").agg(
+        ib_high=("high", "max"), ib_low=("low", "min"),
+    )
+
+    m = ib_agg.join(day_agg, how="inner")
+    m["open_915"] = m["open_915"].astype(float)
+    m["close"] = m["close"].astype(float)
+    return _add_derived_metrics(m)
+
+
+def _add_derived_metrics(m: pd.DataFrame) -> pd.DataFrame:
+    """Fill in ranges, extensions and ratios from per-day IB/day extremes, open and close."""
+    m["ib_range"] = m["ib_high"] - m["ib_low"]
+    m["day_range"] = m["day_high"] - m["day_low"]
+    m["re_up"] = m["day_high"] > m["ib_high"]
+    m["re_down"] = m["day_low"] < m["ib_low"]
+
+    has_open = m["open_915"] != 0
+    has_range = m["day_range"] != 0
+    m["ib_pct"] = (m["ib_range"] / m["open_915"] * 100).where(has_open, 0.0)
+    m["ib_ratio"] = (m["ib_range"] / m["day_range"]).where(has_range, 0.0)
+
+    mid = (m["day_high"] + m["day_low"]) / 2.0
+    m["close_pos_mid"] = ((m["close"] - mid).abs() / m["day_range"]).where(has_range, 0.0)
+    dist = np.minimum((m["close"] - m["day_low"]).abs(), (m["close"] - m["day_high"]).abs())
+    m["close_dist_from_extreme"] = (dist / m["day_range"]).where(has_range, 1.0)
+    return m
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernel():
+    """Build (once) the JIT-compiled per-day reduction; requires `numba`."""
+    from numba import njit, prange
+
+    @njit(parallel=True)
+    def kernel(opens, highs, lows, closes, mods, day_starts, ib_end_min, open_min):
+        n_days = day_starts.shape[0] - 1
+        ib_high = np.full(n_days, -np.inf)
+        ib_low = np.full(n_days, np.inf)
+        day_high = np.full(n_days, -np.inf)
+        day_low = np.full(n_days, np.inf)
+        open_915 = np.empty(n_days)
+        close = np.empty(n_days)
+        has_ib = np.zeros(n_days, dtype=np.bool_)
+        for d in prange(n_days):
+            lo, hi = day_starts[d], day_starts[d + 1]
+            open_915[d] = opens[lo]
+            close[d] = closes[hi - 1]
+            for i in range(lo, hi):
+                if highs[i] > day_high[d]:
+                    day_high[d] = highs[i]
+                if lows[i] < day_low[d]:
+                    day_low[d] = lows[i]
+                if open_min <= mods[i] <= ib_end_min:
+                    has_ib[d] = True
+                    if highs[i] > ib_high[d]:
+                        ib_high[d] = highs[i]
+                    if lows[i] < ib_low[d]:
+                        ib_low[d] = lows[i]
+        return ib_high, ib_low, day_high, day_low, open_915, close, has_ib
+
+    return kernel
+
+
+def compute_daily_metrics_numba(df: pd.DataFrame) -> pd.DataFrame:
+    """Same output as `compute_daily_metrics`, with the per-day reductions done by a numba kernel.
+
+    Bars are sorted once so each IST day is a contiguous slice; the kernel reduces every
+    slice in parallel over raw float64 arrays. Call from the main thread: numba's parallel
+    runtime hangs interpreter exit if first started from a pool worker.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    df = df.sort_values("datetime")
+    days = df["datetime"].dt.tz_convert(IST).dt.normalize()
+    day_keys, day_starts = np.unique(days.values, return_index=True)
+    day_starts = np.append(day_starts, len(df)).astype(np.int64)
+
+    ib_high, ib_low, day_high, day_low, open_915, close, has_ib = _numba_kernel()(
+        df["open"].to_numpy(np.float64), df["high"].to_numpy(np.float64),
+        df["low"].to_numpy(np.float64), df["close"].to_numpy(np.float64),
+        _session_minutes(df).to_numpy(), day_starts, IB_END_MIN, MARKET_OPEN_MIN,
+    )
+    m = pd.DataFrame(
+        {"ib_high": ib_high, "ib_low": ib_low, "day_high": day_high, "day_low": day_low,
+         "open_915": open_915, "close": close},
+        index=pd.DatetimeIndex(day_keys, name="day").tz_localize("UTC").tz_convert(IST),
+    )
+    return _add_derived_metrics(m[has_ib])
+
+
+def compute_daily_stats_polars(df: pd.DataFrame) -> pd.DataFrame:
+    """Polars LazyFrame version of `compute_daily_metrics` plus day-type classification.
+
+    The IB/day aggregations, join, metric columns and classification are one lazy query,
+    collected once with the streaming engine. Returns a pandas frame indexed by IST day.
+    """
+    import polars as pl
+
+    if df.empty:
+        return pd.DataFrame()
+    # Angel returns fixed "+05:30" offsets, which polars rejects; hand it a named zone
+    bars = df[CANDLE_COLUMNS].assign(datetime=df["datetime"].dt.tz_convert(IST))
+    ts = pl.col("datetime")
+    lf = (
+        pl.from_pandas(bars).lazy()
+        .with_columns(day=ts.dt.date(), mod=ts.dt.hour().cast(pl.Int32) * 60 + ts.dt.minute())
+        .sort("datetime")
+    )
+    ib = (
+        lf.filter((pl.col("mod") >= MARKET_OPEN_MIN) & (pl.col("mod") <= IB_END_MIN))
+        .group_by("day")
+        .agg(ib_high=pl.col("high").max(), ib_low=pl.col("low").min())
+    )
+    day = lf.group_by("day").agg(
+        day_high=pl.col("high").max(),
+        day_low=pl.col("low").min(),
+        open_915=pl.col("open").first().cast(pl.Float64),
+        close=pl.col("close").last().cast(pl.Float64),
+    )
+    day_range = pl.col("day_range")
+    has_range = day_range != 0
+    out = (
+        ib.join(day, on="day", how="inner")
+        .with_columns(
+            ib_range=pl.col("ib_high") - pl.col("ib_low"),
+            day_range=pl.col("day_high") - pl.col("day_low"),
+            re_up=pl.col("day_high") > pl.col("ib_high"),
+            re_down=pl.col("day_low") < pl.col("ib_low"),
+        )
+        .with_columns(
+            ib_pct=pl.when(pl.col("open_915") != 0)
+            .then(pl.col("ib_range") / pl.col("open_915") * 100).otherwise(0.0),
+            ib_ratio=pl.when(has_range).then(pl.col("ib_range") / day_range).otherwise(0.0),
+            close_pos_mid=pl.when(has_range)
+            .then((pl.col("close") - (pl.col("day_high") + pl.col("day_low")) / 2.0).abs() / day_range)
+            .otherwise(0.0),
+            close_dist_from_extreme=pl.when(has_range)
+            .then(pl.min_horizontal((pl.col("close") - pl.col("day_low")).abs(),
+                                    (pl.col("close") - pl.col("day_high")).abs()) / day_range)
+            .otherwise(1.0),
+        )
+        .with_columns(day_type=classify_day_type_expr())
+        .sort("day")
+        .collect(engine="streaming")
+    )
+    return out.to_pandas().set_index("day")
+
+
 def daterange(start: date, end: date):
     for n in range((end - start).days + 1):
         yield start + timedelta(n)
@@ -139,11 +553,79 @@ def is_weekend(d: date) -> bool:
     return d.weekday() >= 5
 
 
+def trading_days(start: date, end: date) -> List[date]:
+    """NSE trading sessions in [start, end], excluding weekends and exchange holidays.
+
+    Uses the pandas_market_calendars NSE calendar; falls back to weekdays only if it is
+    not installed.
+    """
+    try:
+        import pandas_market_calendars as mcal
+    except ImportError:
+        return [d for d in daterange(start, end) if not is_weekend(d)]
+    return list(mcal.get_calendar("NSE").valid_days(start, end).date)
+
+
+def month_windows(start: date, end: date):
+    """Yield (first, last) day pairs for each calendar month overlapping [start, end]."""
+    cur = start
+    while cur <= end:
+        next_month = (cur.replace(day=1) + timedelta(days=32)).replace(day=1)
+        last = min(next_month - timedelta(days=1), end)
+        yield cur, last
+        cur = next_month
+
+
+def trading_month_windows(days: List[date]) -> List[Tuple[date, date]]:
+    """(first, last) trading day of each calendar month present in sorted `days`."""
+    windows: Dict[Tuple[int, int], Tuple[date, date]] = {}
+    for d in days:
+        key = (d.year, d.month)
+        windows[key] = (windows[key][0], d) if key in windows else (d, d)
+    return list(windows.values())
+
+
+def _safe_fetch(obj: SmartConnect, meta: Dict, start: date, end: date, interval: str) -> pd.DataFrame:
+    """Fetch one window of bars (runs in the fetch thread pool)."""
+    return fetch_range_candles(obj, meta["exchange"], meta["symboltoken"], start, end, interval)
+
+
+def _daily_stats(df: pd.DataFrame, engine: str) -> pd.DataFrame:
+    """Classified per-day metrics for a window of bars using the selected METRICS_ENGINE."""
+    if engine == "polars":
+        return compute_daily_stats_polars(df)
+    daily = compute_daily_metrics_numba(df) if engine == "numba" else compute_daily_metrics(df)
+    if not daily.empty:
+        daily["day_type"] = classify_day_type_lut(
+            daily["ib_ratio"], daily["re_up"], daily["re_down"],
+            daily["close_pos_mid"], daily["close_dist_from_extreme"],
+        )
+    return daily
+
+
+def _output_rows(daily: pd.DataFrame, index_name: str):
+    """CSV records (OUTPUT_FIELDS) for a classified per-day frame."""
+    for d, day_type, ib_pct, ib_ratio, day_range in zip(
+        daily.index.strftime("%Y-%m-%d"), daily["day_type"],
+        daily["ib_pct"].tolist(), daily["ib_ratio"].tolist(), daily["day_range"].tolist(),
+    ):
+        yield {
+            "date": d,
+            "index": index_name,
+            "day_type": day_type,
+            "ib_size": classify_ib_size(ib_pct),
+            "ib_pct": ib_pct,
+            "ib_ratio": ib_ratio,
+            "day_range": day_range,
+        }
+
+
 def compute_stats():
     """Main fetch-and-classify. Returns DataFrame and writes a dated CSV to data/."""
     load_dotenv()
     interval = os.getenv("INTERVAL", "FIFTEEN_MINUTE")
     years_back = int(os.getenv("YEARS_BACK", "1"))
+    engine = os.getenv("METRICS_ENGINE", "pandas")
 
     obj = angel_login()
 
@@ -151,40 +633,36 @@ def compute_stats():
     start_date = end_date - timedelta(days=years_back * 365)
     start_date = start_date + timedelta(days=1)
 
-    records: List[Dict] = []
-
-    for index_name, meta in INDICES.items():
-        print(f"Processing {index_name} ({meta['trading_symbol']}) ...")
-        for d in tqdm(list(daterange(start_date, end_date)), desc=f"{index_name} days", ncols=100):
-            if is_weekend(d):
-                continue
-            df = fetch_day_candles(obj, meta["exchange"], meta["symboltoken"], d, interval)
-            if df.empty:
-                continue
-            metrics = compute_ib_and_day_metrics(df)
-            if not metrics:
-                continue
-            ib_size = classify_ib_size(metrics["ib_pct"])
-            day_type = classify_day_type(metrics)
-
-            records.append({
-                "date": d.isoformat(),
-                "index": index_name,
-                "day_type": day_type,
-                "ib_size": ib_size,
-                "ib_pct": metrics["ib_pct"],
-                "ib_ratio": metrics["ib_ratio"],
-                "day_range": metrics["day_range"],
-            })
-            time.sleep(0.02)
-
-    result = pd.DataFrame(records)
-    if result.empty:
-        print("No data collected.")
-        return None
+    days = trading_days(start_date, end_date)
+    windows = trading_month_windows(days)
 
+    # Rows are streamed to the CSV as each window completes (so in completion order,
+    # not date order); a crash keeps everything written so far.
     out_csv = f"data/mp_daytype_stats_{date.today().isoformat()}.csv"
     os.makedirs("data", exist_ok=True)
-    result.to_csv(out_csv, index=False)
+    n_rows = 0
+    with open(out_csv, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        # All indices share one pool and rate limiter, so their fetches overlap
+        print(f"Processing {', '.join(INDICES)} ...")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            futures = {
+                ex.submit(_safe_fetch, obj, meta, ws, we, interval): index_name
+                for index_name, meta in INDICES.items()
+                for ws, we in windows
+            }
+            for fut in tqdm(as_completed(futures), total=len(futures), desc="index months", ncols=100):
+                daily = _daily_stats(fut.result(), engine)
+                if daily.empty:
+                    continue
+                writer.writerows(_output_rows(daily, futures[fut]))
+                f.flush()
+                n_rows += len(daily)
+
+    if not n_rows:
+        os.remove(out_csv)
+        print("No data collected.")
+        return None
     print(f"Saved detailed records to {out_csv}")
-    return result
+    return pd.read_csv(out_csv)
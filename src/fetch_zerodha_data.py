@@ -14,11 +14,12 @@ IMPORTANT:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict
-import time
-import openpyxl  # Required for Excel export
 
 # =====================================================================
 # HOW TO GET YOUR ENCTOKEN:
@@ -56,6 +57,16 @@ class ZerodhaDataFetcher:
         """
         self.enctoken = enctoken
         self.session = requests.Session()
+        
+        # Keep-alive pool reused across chunks; transient errors (incl. 429) are
+        # retried with backoff, honouring Retry-After, instead of fixed sleeps
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        self.session.mount("https://", adapter)
         self.headers = {
             "Authorization": f"enctoken {self.enctoken}"
         }
@@ -156,10 +167,12 @@ class ZerodhaDataFetcher:
         print(f"Date range: {start_date.date()} to {end_date.date()}")
         print(f"{'='*70}\n")
         
-        all_data = []
+        # Chunk columns are collected as numpy arrays and concatenated once at the end
+        columns = None
+        all_data = {}
         current_start = start_date
         
-        while current_start < end_date:
+        while current_start <= end_date:
             # Calculate chunk end date
             current_end = min(current_start + timedelta(days=chunk_days), end_date)
             
@@ -173,19 +186,21 @@ class ZerodhaDataFetcher:
             )
             
             if not df.empty:
-                all_data.append(df)
+                if columns is None:
+                    columns = list(df.columns)
+                    all_data = {col: [] for col in columns}
+                for col in columns:
+                    all_data[col].append(df[col].to_numpy())
             
-            # Move to next chunk
-            current_start = current_end
-            
-            # Sleep to avoid rate limiting
-            time.sleep(0.5)
+            # Move to next chunk ("to" is inclusive, so chunks never overlap)
+            current_start = current_end + timedelta(days=1)
         
-        # Combine all chunks
+        # Combine all chunks (already in date order and disjoint)
         if all_data:
-            final_df = pd.concat(all_data, ignore_index=True)
-            final_df = final_df.drop_duplicates(subset=['date'])
-            final_df = final_df.sort_values('date').reset_index(drop=True)
+            final_df = pd.DataFrame(
+                {col: np.concatenate(arrays) for col, arrays in all_data.items()},
+                copy=False
+            )
             
             print(f"\n{'='*70}")
             print(f"✓ COMPLETE: Fetched {len(final_df)} total candles")
@@ -242,9 +257,9 @@ def example_1_fetch_recent_data():
     print(df.head())
     print(f"\nTotal candles: {len(df)}")
     
-    # Save to Excel
-    filename = "reliance_recent_1min.xlsx"
-    df.to_excel(filename, index=False, engine='openpyxl')
+    # Save to Parquet (zstd-compressed, columnar)
+    filename = "reliance_recent_1min.parquet"
+    df.to_parquet(filename, compression='zstd', index=False)
     print(f"\n✓ Data saved to {filename}")
 
 
@@ -266,9 +281,10 @@ def example_2_fetch_10_years():
     print(df.tail())
     print(f"\nTotal candles: {len(df)}")
     
-    # Save to Excel
-    df.to_excel("nifty_bank_5min_10years.xlsx", index=False, engine='openpyxl')
-    print("\n✓ Data saved to nifty_bank_5min_10years.xlsx")
+    # Save to Parquet (zstd-compressed, columnar)
+    # For Excel, convert afterwards: pd.read_parquet(path).to_excel(...)
+    df.to_parquet("nifty_bank_5min_10years.parquet", compression='zstd', index=False)
+    print("\n✓ Data saved to nifty_bank_5min_10years.parquet")
 
 
 def example_3_multiple_timeframes():
@@ -290,8 +306,8 @@ def example_3_multiple_timeframes():
             oi=0
         )
         
-        filename = f"reliance_{tf}_data.xlsx"
-        df.to_excel(filename, index=False, engine='openpyxl')
+        filename = f"reliance_{tf}_data.parquet"
+        df.to_parquet(filename, compression='zstd', index=False)
         print(f"✓ Saved to {filename}")
 
 
@@ -2,9 +2,9 @@
 # -*- coding: utf-8 -*-
 import argparse
 import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 
 plt.rcParams.update({"figure.dpi": 150})
 
@@ -23,30 +23,40 @@ def _ensure_reports_dir():
 
 
 def _pct_table(df, group_cols, value_col="day_type"):
-    counts = df.groupby(group_cols)[value_col].value_counts().rename("count").reset_index()
-    totals = counts.groupby(group_cols)["count"].transform("sum")
-    counts["pct"] = (counts["count"] / totals) * 100.0
-    return counts
-
-
-def _heatmap(data, index, columns, values, title, out_path):
-    pivot = data.pivot_table(index=index, columns=columns, values=values, fill_value=0)
-    pivot = pivot.reindex(columns=DAY_TYPES_ORDER, fill_value=0)
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(pivot, annot=True, fmt=".1f", cmap="YlGnBu")
-    plt.title(title)
-    plt.xlabel(columns.replace("_", " ").title())
-    plt.ylabel(index.replace("_", " ").title())
-    plt.tight_layout()
-    plt.savefig(out_path)
-    plt.close()
+    pivot = pd.crosstab([df[c] for c in group_cols], df[value_col], normalize="index") * 100.0
+    return pivot.reindex(columns=DAY_TYPES_ORDER, fill_value=0)
+
+
+def _heatmap(pivot, title, out_path):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    im = ax.imshow(pivot.values, cmap="YlGnBu", aspect="auto")
+    ax.set_xticks(range(pivot.shape[1]), pivot.columns, rotation=45, ha="right")
+    ax.set_yticks(range(pivot.shape[0]), pivot.index)
+    # Pivot is at most 12 x 6, so per-cell annotation is cheap
+    threshold = (np.nanmax(pivot.values) + np.nanmin(pivot.values)) / 2.0 if pivot.size else 0.0
+    for i, j in np.ndindex(pivot.shape):
+        value = pivot.values[i, j]
+        ax.text(j, i, f"{value:.1f}", ha="center", va="center",
+                color="white" if value > threshold else "black")
+    fig.colorbar(im, ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(pivot.columns.name.replace("_", " ").title())
+    ax.set_ylabel(pivot.index.name.replace("_", " ").title())
+    fig.tight_layout()
+    fig.savefig(out_path)
+    plt.close(fig)
 
 
 def build_heatmaps(csv_path: str):
     _ensure_reports_dir()
-    df = pd.read_csv(csv_path)
-    df["year"] = pd.to_datetime(df["date"]).dt.year
-    df["month"] = pd.to_datetime(df["date"]).dt.month
+    df = pd.read_csv(
+        csv_path,
+        usecols=["date", "index", "day_type"],
+        parse_dates=["date"],
+        dtype={"index": "category", "day_type": "category"},
+    )
+    df["year"] = df["date"].dt.year.astype("int16")
+    df["month"] = df["date"].dt.month.astype("int8")
 
     for idx in df["index"].unique():
         sub = df[df["index"] == idx]
@@ -55,9 +65,6 @@ def build_heatmaps(csv_path: str):
         year_pct = _pct_table(sub, ["year"], "day_type")
         _heatmap(
             year_pct,
-            index="year",
-            columns="day_type",
-            values="pct",
             title=f"{idx} – Year × Day Type (%)",
             out_path=f"reports/{idx.lower()}_year_daytype_heatmap.png",
         )
@@ -66,9 +73,6 @@ def build_heatmaps(csv_path: str):
         month_pct = _pct_table(sub, ["month"], "day_type")
         _heatmap(
             month_pct,
-            index="month",
-            columns="day_type",
-            values="pct",
             title=f"{idx} – Month × Day Type (%)",
             out_path=f"reports/{idx.lower()}_month_daytype_heatmap.png",
         )